@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+"""Tests for `tinkoff_invest_bot.api.async_client_service` module."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+grpc = pytest.importorskip("grpc")
+async_client_service = pytest.importorskip(
+    "tinkoff_invest_bot.api.async_client_service"
+)
+
+
+class FakeMarketData:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.requests = []
+
+    async def get_last_prices(self, instrument_id):
+        self.requests.append(instrument_id)
+        if self.fail:
+            raise grpc.RpcError()
+        return SimpleNamespace(
+            last_prices=[
+                SimpleNamespace(
+                    figi=figi, price=SimpleNamespace(units=1, nano=5 * 10**8)
+                )
+                for figi in instrument_id
+            ]
+        )
+
+
+class FakeAsyncClient:
+    """Stands in for tinkoff.invest.AsyncClient and records its lifecycle."""
+
+    instances = []
+
+    def __init__(self, token, fail=False):
+        self.token = token
+        self.market_data = FakeMarketData(fail)
+        self.entered = False
+        self.exited = False
+        FakeAsyncClient.instances.append(self)
+
+    async def __aenter__(self):
+        self.entered = True
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.exited = True
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    FakeAsyncClient.instances = []
+    monkeypatch.setattr(async_client_service, "AsyncClient", FakeAsyncClient)
+    return FakeAsyncClient
+
+
+def test_client_is_opened_and_closed(fake_client):
+    service = async_client_service.AsyncClientService("token", "account_id")
+    with pytest.raises(RuntimeError):
+        _ = service.client
+
+    async def run():
+        async with service:
+            client = fake_client.instances[0]
+            assert service.client is client and client.entered
+            assert client.token == "token" and not client.exited
+        return client
+
+    client = asyncio.run(run())
+    assert client.exited
+    assert service._client is None
+
+
+def test_get_last_prices_info_in_chunks(fake_client):
+    figi = [f"FIGI{i}" for i in range(450)]
+
+    async def run():
+        async with async_client_service.AsyncClientService("token", "id") as service:
+            return await service.get_last_prices_info(figi)
+
+    prices = asyncio.run(run())
+    requests = fake_client.instances[0].market_data.requests
+    assert [len(chunk) for chunk in requests] == [200, 200, 50]
+    assert prices["figi"].tolist() == figi
+    assert prices["price"].eq(1.5).all()
+
+
+def test_get_last_prices_info_on_error(fake_client, monkeypatch):
+    monkeypatch.setattr(
+        async_client_service,
+        "AsyncClient",
+        lambda token: FakeAsyncClient(token, fail=True),
+    )
+
+    async def run():
+        async with async_client_service.AsyncClientService("token", "id") as service:
+            return await service.get_last_prices_info(["FIGI0"])
+
+    assert asyncio.run(run()).empty
+
+
+def test_get_last_prices_info_rejects_empty_input(fake_client):
+    async def run():
+        async with async_client_service.AsyncClientService("token", "id") as service:
+            return await service.get_last_prices_info([])
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    assert not fake_client.instances[0].market_data.requests
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+"""Tests for `tinkoff_invest_bot.cache` module."""
+
+import os
+import time
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+
+from tinkoff_invest_bot.cache import FileCache, cached
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """A FileCache stored in a temporary directory."""
+    return FileCache(root=tmp_path)
+
+
+def make_service(cache, results=None):
+    """Builds a service whose cached method records every real call."""
+
+    class Service:
+        def __init__(self):
+            self.calls = []
+
+        @cached(cache)
+        def fetch(self, *args, **kwargs):
+            self.calls.append((args, kwargs))
+            if results is not None:
+                return results.pop(0)
+            return {"args": args, "kwargs": kwargs}
+
+    return Service()
+
+
+def test_default_root_is_per_user(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert FileCache().root == tmp_path / "tinkoff_invest_bot"
+
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    root = FileCache().root
+    assert root.is_absolute()
+    assert root.parent.parent == root.home()
+
+
+def test_set_and_get(cache):
+    cache.set("key", {"a": 1})
+    assert cache.get("key") == {"a": 1}
+    assert cache.get("missing") is None
+
+
+def test_entry_is_read_from_disk(cache):
+    cache.set("key", [1, 2, 3])
+    assert FileCache(root=cache.root).get("key") == [1, 2, 3]
+
+
+def test_memory_tier_avoids_disk(cache):
+    cache.set("key", "value")
+    cache._path("key").unlink()
+    assert cache.get("key") == "value"
+
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = FileCache(root=tmp_path, ttl=timedelta(0))
+    cache.set("key", "value")
+    time.sleep(0.01)
+    assert cache.get("key") is None
+
+
+def test_old_file_is_a_miss(cache):
+    cache.set("key", "value")
+    old = time.time() - timedelta(hours=25).total_seconds()
+    os.utime(cache._path("key"), (old, old))
+    assert FileCache(root=cache.root).get("key") is None
+
+
+@pytest.mark.parametrize(
+    "content", [b"", b"not a pickle", b"cmissing_module\nthing\n."]
+)
+def test_corrupt_entry_is_a_miss(cache, content):
+    cache.root.mkdir(parents=True, exist_ok=True)
+    cache._path("key").write_bytes(content)
+    assert cache.get("key") is None
+
+
+def test_decorator_hits_on_same_arguments(cache):
+    service = make_service(cache)
+    assert service.fetch("url", table_index=1) == service.fetch("url", table_index=1)
+    assert len(service.calls) == 1
+
+
+def test_decorator_keys_on_arguments(cache):
+    service = make_service(cache)
+    service.fetch("url")
+    service.fetch("other")
+    service.fetch("url", table_index=1)
+    assert len(service.calls) == 3
+
+
+@pytest.mark.parametrize("empty", [None, pd.DataFrame()])
+def test_decorator_skips_empty_results(cache, empty):
+    service = make_service(cache, results=[empty, pd.DataFrame({"a": [1]})])
+    assert service.fetch("url") is empty
+    assert service.fetch("url").equals(pd.DataFrame({"a": [1]}))
+    assert len(service.calls) == 2
+    assert len(list(cache.root.glob("*.pkl"))) == 1
+
+
+def test_returned_objects_are_copies(cache):
+    frame = pd.DataFrame({"a": [1, 2]})
+    cache.set("key", frame)
+    frame.loc[0, "a"] = 100
+
+    cached_frame = cache.get("key")
+    cached_frame["b"] = 0
+    assert cache.get("key").equals(pd.DataFrame({"a": [1, 2]}))
+    assert cache.get("key") is not cache.get("key")
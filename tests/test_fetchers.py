@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+"""Tests for `tinkoff_invest_bot.data.fetchers` module."""
+
+import pandas as pd
+import pytest
+import requests
+
+from tinkoff_invest_bot.data.fetchers import MMVBDataFetcher
+
+SMART_LAB_INDEX = """<html><head><meta charset="utf-8"></head><body>
+<table class="simple-little-table">
+<tr><th>№</th><th>Название</th><th>Вес</th><th>Цена</th><th>Изм</th></tr>
+<tr><td>1</td><td>Сбербанк</td><td>14.52%</td><td>300.5</td><td>+1.2%</td></tr>
+<tr><td>2</td><td>Газпром</td><td>10%</td><td>150</td><td>-0.5%</td></tr>
+</table></body></html>"""
+
+SMART_LAB_SHARES = """<html><head><meta charset="utf-8"></head><body>
+<table class="simple-little-table">
+<tr><th>№</th><th>Название</th><th>Тикер</th><th>Цена</th></tr>
+<tr><td>1</td><td>Газпром</td><td>GAZP</td><td>150</td></tr>
+<tr><td>2</td><td>Сбербанк</td><td>SBER</td><td>300.5</td></tr>
+</table></body></html>"""
+
+
+@pytest.fixture
+def fetcher():
+    """A fetcher whose HTTP session is closed after the test."""
+    fetcher = MMVBDataFetcher()
+    yield fetcher
+    fetcher.close()
+
+
+def index_table(names, weights):
+    """An index table shaped like the parsed smart-lab index page."""
+    return pd.DataFrame(
+        {
+            "№": range(1, len(names) + 1),
+            "Название": names,
+            "Вес": weights,
+            "Цена": 0.0,
+            "Изм": "0%",
+        }
+    )
+
+
+def test_validate_data_with_ambiguous_name(fetcher, caplog):
+    tickers = pd.DataFrame(
+        {
+            "Название": ["Сбербанк", "Сбербанк", "Сбербанк", "Газпром"],
+            "Тикер": ["SBER", "SBER", "SBERP", "GAZP"],
+        }
+    )
+    data = fetcher.validate_data(
+        index_table(["Сбербанк", "Газпром"], ["10%", "5%"]), tickers
+    )
+    assert data["ticker"].tolist() == ["SBER", "GAZP"]
+    assert "Several tickers found for shares, using the first one: Сбербанк" in (
+        caplog.text
+    )
+
+
+def test_parse_and_validate_smart_lab_tables(fetcher):
+    data = fetcher._parse(SMART_LAB_INDEX.encode())
+    assert data.columns.tolist() == ["№", "Название", "Вес", "Цена", "Изм"]
+    tickers = fetcher._parse(SMART_LAB_SHARES.encode())
+
+    # The header row is consumed by the parser, so no constituent is skipped
+    validated = fetcher.validate_data(data, tickers)
+    assert validated["ticker"].tolist() == ["SBER", "GAZP"]
+    assert validated["weight"].tolist() == [14.52, 10.0]
+
+
+def test_parse_missing_table(fetcher):
+    assert fetcher._parse(SMART_LAB_INDEX.encode(), table_index=1) is None
+    assert fetcher._parse(b"<html><body><p>No tables</p></body></html>") is None
+    assert fetcher._parse(None) is None
+
+
+def test_validate_data_drops_unmatched_names(fetcher, caplog):
+    tickers = pd.DataFrame({"Название": ["Сбербанк"], "Тикер": ["SBER"]})
+    data = fetcher.validate_data(
+        index_table(["Сбербанк", "Новая компания"], ["10%", "5%"]), tickers
+    )
+    assert data["ticker"].tolist() == ["SBER"]
+    assert data["weight"].tolist() == [10.0]
+    assert "No ticker found for index constituents: Новая компания" in caplog.text
+
+
+def test_validate_data_with_malformed_weight(fetcher):
+    tickers = pd.DataFrame(
+        {"Название": ["Сбербанк", "Газпром"], "Тикер": ["SBER", "GAZP"]}
+    )
+    data = fetcher.validate_data(
+        index_table(["Сбербанк", "Газпром"], ["10%", "n/a"]), tickers
+    )
+    assert data["ticker"].tolist() == ["SBER", "GAZP"]
+    assert data["weight"].iloc[0] == 10.0
+    assert pd.isna(data["weight"].iloc[1])
+
+
+def test_validate_data_without_any_match(fetcher, caplog):
+    tickers = pd.DataFrame({"Название": ["Sberbank"], "Тикер": ["SBER"]})
+    data = fetcher.validate_data(index_table(["Сбербанк"], ["10%"]), tickers)
+    assert data is None
+    assert "No index constituent could be matched to a ticker." in caplog.text
+
+
+def make_response(content, content_type):
+    """A successful HTTP response with the given body and Content-Type."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    response.headers["Content-Type"] = content_type
+    # Set the way requests' HTTPAdapter does when building a response
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+@pytest.mark.parametrize(
+    "content_type, page",
+    [
+        # Charset declared only in the HTTP header
+        (
+            "text/html; charset=windows-1251",
+            SMART_LAB_SHARES.replace('<meta charset="utf-8">', "").encode("cp1251"),
+        ),
+        # Charset declared only in the page
+        ("text/html", SMART_LAB_SHARES.encode()),
+    ],
+    ids=["header-charset", "meta-charset"],
+)
+def test_fetch_index_data_decodes_page(fetcher, monkeypatch, content_type, page):
+    monkeypatch.setattr(
+        fetcher.session, "get", lambda url, timeout: make_response(page, content_type)
+    )
+    data = fetcher.fetch_index_data(
+        "https://smart-lab.ru/q/shares/", columns=["Название", "Тикер"]
+    )
+    assert data["Название"].tolist() == ["Газпром", "Сбербанк"]
+    assert data["Тикер"].tolist() == ["GAZP", "SBER"]
@@ -2,9 +2,10 @@
 
 """Tests for `tinkoff_invest_bot` package."""
 
+import numpy as np
+import pandas as pd
 import pytest
 
-
 from tinkoff_invest_bot import tinkoff_invest_bot
 
 
@@ -22,3 +23,106 @@ def test_content(response):
     """Sample pytest test function with the pytest fixture as an argument."""
     # from bs4 import BeautifulSoup
     # assert 'GitHub' in BeautifulSoup(response.content).title.string
+
+
+@pytest.fixture
+def strategies():
+    """The strategies module, skipped when the Tinkoff Invest SDK is missing."""
+    pytest.importorskip("tinkoff.invest")
+    from tinkoff_invest_bot.strategy import strategies
+
+    return strategies
+
+
+def make_strategy(
+    strategies, shares, prices, positions=None, money=10000.0, tickers=None
+):
+    """Builds an MMVBStrategy that serves fixed data instead of calling the APIs.
+
+    The index holds SBER and GAZP with equal weights.
+    """
+
+    class Strategy(strategies.MMVBStrategy):
+        def fetch_index_data(self, url, table_index=0, columns=None):
+            return pd.DataFrame(
+                {
+                    "№": [1, 2],
+                    "Название": ["Сбербанк", "Газпром"],
+                    "Вес": ["50%", "50%"],
+                    "Цена": [0, 0],
+                    "Изм": [0, 0],
+                }
+            )
+
+        def fetch_tickers_data(self, url, table_index=0):
+            return pd.DataFrame(
+                tickers or [("Сбербанк", "SBER"), ("Газпром", "GAZP")],
+                columns=["Название", "Тикер"],
+            )
+
+        def get_shares_info(self):
+            return pd.DataFrame(shares, columns=["ticker", "figi", "lot", "class_code"])
+
+        def get_positions_info(self):
+            return pd.DataFrame(positions or [], columns=["figi", "balance"])
+
+        def get_last_prices_info(self, figi):
+            return pd.DataFrame(prices, columns=["figi", "price"])
+
+        def get_money(self):
+            return money
+
+    return Strategy(token="token", account_id="account_id")
+
+
+def test_search_shares_to_buy_with_duplicated_ticker(strategies, caplog):
+    strategy = make_strategy(
+        strategies,
+        shares=[
+            ("SBER", "SBER_SPB", 1, "SPBXM"),
+            ("GAZP", "GAZP_TQBR", 10, "TQBR"),
+            ("SBER", "SBER_TQBR", 10, "TQBR"),
+        ],
+        prices=[("SBER_TQBR", 300.0), ("GAZP_TQBR", 150.0), ("SBER_SPB", 301.0)],
+    )
+    # The main board listing is used even though the API returned another one first
+    assert strategy.search_shares_to_buy() == {"SBER_TQBR": 1, "GAZP_TQBR": 3}
+    assert "SBER (SPBXM)" in caplog.text
+
+
+def test_select_buys(strategies):
+    to_buy_rubles, mask, lots = strategies._select_buys(
+        ideal=np.array([5000.0, 5000.0, 5000.0, 5000.0, 1000.9]),
+        rubles=np.array([0.0, 0.0, 0.0, 4500.0, 0.0]),
+        lot_price=np.array([1500.0, np.nan, 20000.0, 100.0, 1000.0]),
+        money=10000.0,
+    )
+    np.testing.assert_array_equal(to_buy_rubles, [5000, 5000, 5000, 500, 1000])
+    # A missing price, a lot above the money and a floored difference equal to the
+    # lot price are not selected
+    np.testing.assert_array_equal(mask, [True, False, False, True, False])
+    np.testing.assert_array_equal(lots, [3, 5])
+
+
+def test_search_shares_to_buy(strategies):
+    strategy = make_strategy(
+        strategies,
+        shares=[("SBER", "SBER_TQBR", 10, "TQBR"), ("GAZP", "GAZP_TQBR", 10, "TQBR")],
+        prices=[("SBER_TQBR", 300.0), ("GAZP_TQBR", 150.0)],
+        positions=[("GAZP_TQBR", 30)],
+        money=10000.0,
+    )
+    # The total is 14500 rubles, so the ideal volume of each share is 7250 rubles
+    assert strategy.search_shares_to_buy() == {"SBER_TQBR": 2, "GAZP_TQBR": 1}
+    assert strategy.portfolio["to_buy_rubles"].tolist() == [7250, 2750]
+
+
+def test_search_shares_to_buy_without_index_weights(strategies):
+    strategy = make_strategy(
+        strategies,
+        shares=[("SBER", "SBER_TQBR", 10, "TQBR")],
+        prices=[("SBER_TQBR", 300.0)],
+        tickers=[("Sberbank", "SBER")],
+    )
+    with pytest.raises(RuntimeError):
+        strategy.search_shares_to_buy()
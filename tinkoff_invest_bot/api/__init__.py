@@ -1 +1 @@
-__all__ = ["client_service"]
+__all__ = ["client_service", "async_client_service", "frames"]
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from itertools import chain
+from typing import Optional, Sequence
+
+import grpc
+import pandas as pd
+from tinkoff.invest import AsyncClient
+from tinkoff.invest.async_services import AsyncServices
+from tinkoff.invest.exceptions import AioRequestError
+
+from tinkoff_invest_bot.api.frames import (
+    figi_chunks,
+    last_prices_frame,
+    positions_frame,
+    shares_frame,
+)
+from tinkoff_invest_bot.utils import cast_money
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncClientService:
+    """
+    An asyncio counterpart of ClientService for the Tinkoff Invest API.
+
+    All requests share one AsyncClient channel, so independent calls can be
+    awaited together with `asyncio.gather` and run concurrently.
+
+    Attributes
+    ----------
+    __token : str
+        The API token for authentication.
+    __account_id : str
+        The account ID for operations.
+
+    Examples
+    --------
+    >>> async with AsyncClientService(token='your_token', account_id='your_account_id') as service:
+    ...     positions, money = await asyncio.gather(
+    ...         service.get_positions_info(), service.get_money()
+    ...     )
+    """
+
+    def __init__(self, token: str, account_id: str) -> None:
+        """
+        Initializes the AsyncClientService with a given token and account ID.
+
+        Parameters
+        ----------
+        token : str
+            The API token for Tinkoff Invest authentication.
+        account_id : str
+            The account ID for performing operations.
+        """
+        self.__token = token
+        self.__account_id = account_id
+        self._stack = AsyncExitStack()
+        self._client: Optional[AsyncServices] = None
+
+    async def __aenter__(self):
+        self._client = await self._stack.enter_async_context(AsyncClient(self.__token))
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def client(self) -> AsyncServices:
+        """
+        The entered Tinkoff Invest API client.
+
+        Raises
+        ------
+        RuntimeError
+            If the service is used outside of an `async with` block.
+        """
+        if self._client is None:
+            raise RuntimeError("AsyncClientService must be used with 'async with'.")
+        return self._client
+
+    async def close(self) -> None:
+        """
+        Closes the Tinkoff Invest API client if it has been opened.
+        """
+        await self._stack.aclose()
+        self._client = None
+
+    async def get_shares_info(self) -> pd.DataFrame:
+        """
+        Retrieves information about available shares from the Tinkoff Invest API.
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame containing the ticker, FIGI, lot size, and board class code
+            of each share,
+            or an empty DataFrame if the API request fails.
+        """
+        try:
+            shares = await self.client.instruments.shares()
+            return shares_frame(shares.instruments)
+        except (AioRequestError, grpc.RpcError) as e:
+            logger.warning("Failed to retrieve shares information: %s", e)
+            return pd.DataFrame()  # Return an empty DataFrame in case of failure
+
+    async def get_positions_info(self) -> pd.DataFrame:
+        """
+        Retrieves information about the current positions (securities) for the specified account.
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame containing the FIGI and balance of each security position,
+            or an empty DataFrame if the API request fails.
+        """
+        try:
+            positions = await self.client.operations.get_positions(
+                account_id=self.__account_id
+            )
+            return positions_frame(positions.securities)
+        except (AioRequestError, grpc.RpcError) as e:
+            logger.warning("Failed to retrieve positions information: %s", e)
+            return pd.DataFrame()  # Return an empty DataFrame in case of failure
+
+    async def get_last_prices_info(self, figi: Sequence[str]) -> pd.DataFrame:
+        """
+        Retrieves the last known prices for a list of financial instruments identified by their FIGI.
+
+        Parameters
+        ----------
+        figi : Sequence[str]
+            A list or array of FIGI (Financial Instrument Global Identifier) codes for which to retrieve the last prices.
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame containing the FIGI and last price for each requested financial instrument,
+            or an empty DataFrame if the API request fails.
+
+        Raises
+        ------
+        ValueError
+            If the input is a string or an empty sequence.
+        """
+        chunks = figi_chunks(figi)
+        try:
+            responses = await asyncio.gather(
+                *(
+                    self.client.market_data.get_last_prices(instrument_id=chunk)
+                    for chunk in chunks
+                )
+            )
+            return last_prices_frame(
+                list(
+                    chain.from_iterable(response.last_prices for response in responses)
+                )
+            )
+        except (AioRequestError, grpc.RpcError) as e:
+            logger.warning("Failed to retrieve last prices information: %s", e)
+            return pd.DataFrame()  # Return an empty DataFrame in case of failure
+
+    async def get_money(self):
+        """
+        Retrieves the total amount of money in the specified account's portfolio.
+
+        Returns
+        -------
+        float or None
+            The total money amount in the account's portfolio, or None if the
+            retrieval fails.
+        """
+        try:
+            portfolio = await self.client.operations.get_portfolio(
+                account_id=self.__account_id
+            )
+            return cast_money(portfolio.total_amount_currencies)
+        except (AioRequestError, grpc.RpcError) as e:
+            logger.warning("Failed to retrieve money information: %s", e)
+            return None
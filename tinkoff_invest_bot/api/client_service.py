@@ -1,10 +1,26 @@
-from typing import List
-
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import chain
+from typing import Optional, Sequence
+
+import grpc
 import pandas as pd
-from tinkoff.invest import Client
-
+from tinkoff.invest import Client, RequestError
+from tinkoff.invest.services import Services
+
+from tinkoff_invest_bot.api.frames import (
+    figi_chunks,
+    last_prices_frame,
+    positions_frame,
+    shares_frame,
+)
+from tinkoff_invest_bot.cache import FileCache, cached
 from tinkoff_invest_bot.utils import cast_money
 
+logger = logging.getLogger(__name__)
+
 
 class ClientService:
     """
@@ -19,6 +35,11 @@ class ClientService:
         The API token for authentication.
     __account_id : str
         The account ID for operations.
+
+    Examples
+    --------
+    >>> with ClientService(token='your_token', account_id='your_account_id') as service:
+    ...     print(service.get_positions_info())
     """
 
     def __init__(self, token: str, account_id: str) -> None:
@@ -34,27 +55,63 @@ class ClientService:
         """
         self.__token = token
         self.__account_id = account_id
+        self._stack = ExitStack()
+        self._client: Optional[Services] = None
+        self._client_lock = threading.Lock()
+
+    def __enter__(self):
+        self._get_client()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _get_client(self) -> Services:
+        """
+        Returns the shared Tinkoff Invest API client, opening it on first use.
+
+        The underlying gRPC channel is kept open and reused by every subsequent
+        call until `close` is invoked. Opening is guarded by a lock, so methods can
+        be called from several threads.
+
+        Returns
+        -------
+        Services
+            The entered Tinkoff Invest API client.
+        """
+        with self._client_lock:
+            if self._client is None:
+                self._client = self._stack.enter_context(Client(self.__token))
+            return self._client
+
+    def close(self) -> None:
+        """
+        Closes the shared Tinkoff Invest API client if it has been opened.
+        """
+        with self._client_lock:
+            self._stack.close()
+            self._client = None
 
+    @cached(FileCache())
     def get_shares_info(self) -> pd.DataFrame:
         """
         Retrieves information about available shares from the Tinkoff Invest API.
 
+        The result is cached on disk for a day, since the list of shares changes rarely.
+
         Returns
         -------
         pd.DataFrame
-            A DataFrame containing the ticker, FIGI, and lot size of each share.
+            A DataFrame containing the ticker, FIGI, lot size, and board class code
+            of each share,
+            or an empty DataFrame if the API request fails.
         """
-        with Client(self.__token) as client:
-            try:
-                shares = client.instruments.shares().instruments
-                shares_info = [
-                    {"ticker": item.ticker, "figi": item.figi, "lot": item.lot}
-                    for item in shares
-                ]
-                return pd.DataFrame(shares_info)
-            except Exception as e:
-                print(f"Failed to retrieve shares information: {e}")
-                return pd.DataFrame()  # Return an empty DataFrame in case of failure
+        client = self._get_client()
+        try:
+            return shares_frame(client.instruments.shares().instruments)
+        except (RequestError, grpc.RpcError) as e:
+            logger.warning("Failed to retrieve shares information: %s", e)
+            return pd.DataFrame()  # Return an empty DataFrame in case of failure
 
     def get_positions_info(self) -> pd.DataFrame:
         """
@@ -63,60 +120,61 @@ class ClientService:
         Returns
         -------
         pd.DataFrame
-            A DataFrame containing the FIGI and balance of each security position.
+            A DataFrame containing the FIGI and balance of each security position,
+            or an empty DataFrame if the API request fails.
         """
-        with Client(self.__token) as client:
-            try:
-                positions = client.operations.get_positions(
-                    account_id=self.__account_id
-                ).securities
-                positions_info = [
-                    {
-                        "figi": pos.figi,
-                        "balance": pos.balance if pos.balance is not None else 0,
-                    }
-                    for pos in positions
-                ]
-                return pd.DataFrame(positions_info)
-            except Exception as e:
-                print(f"Failed to retrieve positions information: {e}")
-                return pd.DataFrame()  # Return an empty DataFrame in case of failure
-
-    def get_last_prices_info(self, figi: List[str]) -> pd.DataFrame:
+        client = self._get_client()
+        try:
+            positions = client.operations.get_positions(
+                account_id=self.__account_id
+            ).securities
+            return positions_frame(positions)
+        except (RequestError, grpc.RpcError) as e:
+            logger.warning("Failed to retrieve positions information: %s", e)
+            return pd.DataFrame()  # Return an empty DataFrame in case of failure
+
+    def get_last_prices_info(self, figi: Sequence[str]) -> pd.DataFrame:
         """
         Retrieves the last known prices for a list of financial instruments identified by their FIGI.
 
         Parameters
         ----------
-        figi : List[str]
-            A list of FIGI (Financial Instrument Global Identifier) codes for which to retrieve the last prices.
+        figi : Sequence[str]
+            A list or array of FIGI (Financial Instrument Global Identifier) codes for which to retrieve the last prices.
 
         Returns
         -------
         pd.DataFrame
-            A DataFrame containing the FIGI and last price for each requested financial instrument.
+            A DataFrame containing the FIGI and last price for each requested financial instrument,
+            or an empty DataFrame if the API request fails.
+
+        Notes
+        -----
+        Large FIGI lists are split into chunks of `LAST_PRICES_CHUNK_SIZE` codes that are
+        requested concurrently over the shared gRPC channel.
 
         Raises
         ------
         ValueError
-            If the input is not a list or is an empty list.
+            If the input is a string or an empty sequence.
         """
-        if not figi or not isinstance(figi, list):
-            raise ValueError("Input must be a non-empty list of FIGI codes.")
-
-        with Client(self.__token) as client:
-            try:
-                prices = client.market_data.get_last_prices(
-                    instrument_id=figi
-                ).last_prices
-                prices_info = [
-                    {"figi": price.figi, "price": cast_money(price.price)}
-                    for price in prices
-                ]
-                return pd.DataFrame(prices_info)
-            except Exception as e:
-                print(f"Failed to retrieve last prices information: {e}")
-                return pd.DataFrame()  # Return an empty DataFrame in case of failure
+        chunks = figi_chunks(figi)
+        client = self._get_client()
+        try:
+            with ThreadPoolExecutor(max_workers=min(8, len(chunks))) as executor:
+                responses = executor.map(
+                    lambda chunk: client.market_data.get_last_prices(
+                        instrument_id=chunk
+                    ),
+                    chunks,
+                )
+                prices = list(
+                    chain.from_iterable(response.last_prices for response in responses)
+                )
+            return last_prices_frame(prices)
+        except (RequestError, grpc.RpcError) as e:
+            logger.warning("Failed to retrieve last prices information: %s", e)
+            return pd.DataFrame()  # Return an empty DataFrame in case of failure
 
     def get_money(self):
         """
@@ -124,12 +182,12 @@ class ClientService:
 
         This method connects to the Tinkoff Invest API using the provided token and account ID,
         and fetches the total amount of all currencies in the portfolio, converting the value
-        to a decimal representation for precision.
+        to a float.
 
         Returns
         -------
-        Decimal or None
-            The total money amount in the account's portfolio as a Decimal, or None if the
+        float or None
+            The total money amount in the account's portfolio as a float, or None if the
             retrieval fails.
 
         Examples
@@ -140,14 +198,14 @@ class ClientService:
 
         Notes
         -----
-        The method catches and prints any exceptions that occur during the API call, returning
-        None in case of failure to allow for graceful error handling by the caller.
+        API errors (`RequestError` or `grpc.RpcError`) are logged and None is returned
+        to allow for graceful error handling by the caller; any other exception propagates.
         """
-        with Client(self.__token) as client:
-            try:
-                money = client.operations.get_portfolio(account_id=self.__account_id)
-                money = cast_money(money.total_amount_currencies)
-                return money
-            except Exception as e:
-                print(f"Failed to retrieve money information: {e}")
-                return None
+        client = self._get_client()
+        try:
+            money = client.operations.get_portfolio(account_id=self.__account_id)
+            money = cast_money(money.total_amount_currencies)
+            return money
+        except (RequestError, grpc.RpcError) as e:
+            logger.warning("Failed to retrieve money information: %s", e)
+            return None
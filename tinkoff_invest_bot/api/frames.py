@@ -0,0 +1,73 @@
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+LAST_PRICES_CHUNK_SIZE = 200
+
+
+def shares_frame(shares) -> pd.DataFrame:
+    """
+    Builds a DataFrame with the ticker, FIGI, lot size, and board class code of each share.
+    """
+    return pd.DataFrame(
+        {
+            "ticker": [item.ticker for item in shares],
+            "figi": [item.figi for item in shares],
+            "lot": np.fromiter(
+                (item.lot for item in shares), dtype=np.int32, count=len(shares)
+            ),
+            "class_code": [item.class_code for item in shares],
+        }
+    )
+
+
+def positions_frame(positions) -> pd.DataFrame:
+    """
+    Builds a DataFrame with the FIGI and balance of each security position.
+    """
+    return pd.DataFrame(
+        {
+            "figi": [pos.figi for pos in positions],
+            "balance": np.fromiter(
+                (pos.balance or 0 for pos in positions),
+                dtype=np.int64,
+                count=len(positions),
+            ),
+        }
+    )
+
+
+def last_prices_frame(prices) -> pd.DataFrame:
+    """
+    Builds a DataFrame with the FIGI and last price of each instrument.
+    """
+    # Combine units and nano as whole arrays instead of casting each price
+    units = np.fromiter(
+        (price.price.units for price in prices),
+        dtype=np.int64,
+        count=len(prices),
+    )
+    nano = np.fromiter(
+        (price.price.nano for price in prices),
+        dtype=np.int32,
+        count=len(prices),
+    )
+    return pd.DataFrame(
+        {
+            "figi": [price.figi for price in prices],
+            "price": units + nano / 1e9,
+        }
+    )
+
+
+def figi_chunks(figi: Sequence[str]) -> List[List[str]]:
+    """
+    Splits a sequence of FIGI codes into chunks accepted by a single GetLastPrices request.
+    """
+    if isinstance(figi, str) or len(figi) == 0:
+        raise ValueError("Input must be a non-empty sequence of FIGI codes.")
+    return [
+        list(figi[i : i + LAST_PRICES_CHUNK_SIZE])
+        for i in range(0, len(figi), LAST_PRICES_CHUNK_SIZE)
+    ]
@@ -0,0 +1,159 @@
+import copy
+import hashlib
+import logging
+import os
+import pickle
+import time
+from datetime import timedelta
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class FileCache:
+    """
+    A simple on-disk cache with a time-to-live for each entry.
+
+    Entries are pickled into separate files under the `root` directory and are
+    considered stale once their modification time is older than `ttl`. Entries that
+    have been read or written are also kept in memory, so repeated lookups within
+    one process do not touch the disk. Callers always receive their own copy, so
+    mutating a returned object does not affect the cache.
+
+    Attributes
+    ----------
+    root : Path
+        Directory where cache entries are stored.
+    ttl : timedelta
+        Maximum age of a cache entry before it is ignored.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Union[str, Path]] = None,
+        ttl: timedelta = timedelta(hours=24),
+    ) -> None:
+        """
+        Parameters
+        ----------
+        root : str or Path, optional
+            Directory where cache entries are stored (default is
+            "tinkoff_invest_bot" under $XDG_CACHE_HOME or ~/.cache).
+        ttl : timedelta, optional
+            Maximum age of a cache entry (default is 24 hours).
+        """
+        if root is None:
+            root = (
+                Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+                / "tinkoff_invest_bot"
+            )
+        self.root = Path(root)
+        self.ttl = ttl
+        self._memory: Dict[str, Tuple[float, Any]] = {}
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the cached object for the given key.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        object or None
+            The cached object, or None if there is no fresh entry for the key
+            or the stored entry cannot be loaded.
+        """
+        ttl = self.ttl.total_seconds()
+        if key in self._memory:
+            created, obj = self._memory[key]
+            if time.time() - created <= ttl:
+                return copy.deepcopy(obj)
+            del self._memory[key]
+
+        path = self._path(key)
+        try:
+            created = path.stat().st_mtime
+            if time.time() - created > ttl:
+                return None
+            with path.open("rb") as file:
+                obj = pickle.load(file)
+        except Exception:
+            # A missing, unreadable or stale pickle is simply a cache miss
+            return None
+        self._memory[key] = (created, obj)
+        return copy.deepcopy(obj)
+
+    def set(self, key: str, obj: Any) -> None:
+        """
+        Stores an object in the cache under the given key.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        obj : object
+            The object to store. It must be picklable.
+        """
+        self._memory[key] = (time.time(), copy.deepcopy(obj))
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with self._path(key).open("wb") as file:
+                pickle.dump(obj, file)
+        except OSError as e:
+            logger.warning("Failed to write cache entry: %s", e)
+
+
+def cached(cache: FileCache) -> Callable:
+    """
+    Decorates a method so that its result is stored in the given FileCache.
+
+    The cache key is the MD5 hash of the method's qualified name and its
+    arguments (excluding `self`). Empty results (None or an empty DataFrame)
+    are treated as failures and are not cached.
+
+    Parameters
+    ----------
+    cache : FileCache
+        The cache used to store the results.
+
+    Returns
+    -------
+    Callable
+        The decorator.
+
+    Examples
+    --------
+    >>> class Service:
+    ...     @cached(FileCache(ttl=timedelta(hours=1)))
+    ...     def fetch(self, url):
+    ...         ...
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = hashlib.md5(
+                repr((func.__qualname__, args, sorted(kwargs.items()))).encode()
+            ).hexdigest()
+            result = cache.get(key)
+            if result is None:
+                result = func(self, *args, **kwargs)
+                if result is not None and not (
+                    isinstance(result, pd.DataFrame) and result.empty
+                ):
+                    cache.set(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -1,11 +1,17 @@
-from typing import Optional
+import logging
+from io import BytesIO
+from typing import List, Optional, Tuple, Union
 
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup, element
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from ..cache import FileCache, cached
 from .base import IndexDataFetcher
 
+logger = logging.getLogger(__name__)
+
 
 class MMVBDataFetcher(IndexDataFetcher):
     """
@@ -13,117 +19,164 @@ class MMVBDataFetcher(IndexDataFetcher):
 
     Attributes
     ----------
-    url : str
-        URL of the webpage to fetch data from.
-    html : str, optional
-        HTML content of the fetched webpage, initially None and cached after first fetch.
+    session : requests.Session
+        HTTP session with a keep-alive connection pool shared by all fetches.
 
     Methods
     -------
-    fetch_html():
-        Fetches and returns the HTML content of the webpage.
-
-    parse_table(table_index=0):
-        Parses and returns the data of a specified table from the webpage as a pandas DataFrame.
+    fetch_index_data(url, table_index=0):
+        Fetches a webpage and returns the data of a specified table as a pandas DataFrame.
 
-    parse_table_data(table):
-        Extracts and returns table data from a BeautifulSoup table object as a pandas DataFrame.
+    fetch_tickers_data(url, table_index=0):
+        Same as fetch_index_data, but cached on disk for a day.
 
-    validate_data(data, skip_rows=1, skip_start_columns=1, skip_end_columns=2):
+    validate_data(data, tickers, skip_rows=0, skip_columns=(1, 2)):
         Validates and returns a modified pandas DataFrame based on specified trimming parameters.
+
+    close():
+        Closes the HTTP session.
     """
 
     def __init__(self):
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=4,
+                max_retries=Retry(total=2, backoff_factor=0.2),
+            ),
+        )
+        self.session.headers.update(
+            {
+                "User-Agent": "Mozilla/5.0 (compatible; tinkoff_invest_bot)",
+                "Accept-Encoding": "gzip, deflate",
+            }
+        )
+
+    def close(self) -> None:
         """
-        Parameters
-        ----------
-        url : str
-            The URL of the webpage from which to fetch data.
+        Closes the HTTP session and its pooled connections.
         """
-        self.html: Optional[str] = None
+        self.session.close()
 
-    def fetch_html(self) -> Optional[str]:
+    def _fetch_bytes(self, url: str) -> Tuple[Optional[bytes], Optional[str]]:
         """
-        Fetches and caches the HTML content of the webpage specified by the url attribute.
+        Fetches the raw HTML content of the given URL.
+
+        The response is transferred gzip-compressed when the server supports it
+        and is decompressed transparently by the session. The body is returned as
+        bytes together with the charset declared in the Content-Type header, so the
+        parser decodes it once. Without a declared charset the parser detects the
+        encoding from the page itself.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the webpage to fetch.
 
         Returns
         -------
-        str or None
-            HTML content of the webpage, or None if an error occurs during fetching.
+        tuple
+            HTML content of the webpage and its declared charset. The content is None
+            if an error occurs during fetching; the charset is None if the response
+            does not declare one.
         """
-        if self.html is None:
-            try:
-                response = requests.get(self.url, timeout=10)  # Timeout added
-                response.raise_for_status()
-                self.html = response.text
-            except requests.RequestException as e:
-                print(f"Error fetching the webpage: {e}")
-        return self.html
-
-    def fetch_index_data(self, url, table_index: int = 0) -> Optional[pd.DataFrame]:  # type: ignore[override]
-        # method implementation
+        try:
+            response = self.session.get(url, timeout=10)  # Timeout added
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "").lower()
+            encoding = response.encoding if "charset=" in content_type else None
+            return response.content, encoding
+        except requests.RequestException as e:
+            logger.warning("Error fetching the webpage: %s", e)
+        return None, None
+
+    def _parse(
+        self,
+        html: Optional[bytes],
+        table_index: int = 0,
+        encoding: Optional[str] = None,
+    ) -> Optional[pd.DataFrame]:
         """
-        Parses a table from the fetched HTML content based on the specified index.
+        Parses a table from the given HTML content based on the specified index.
 
         Parameters
         ----------
+        html : bytes or None
+            Raw HTML content of the webpage.
         table_index : int, optional
             Index of the table to parse from the HTML (default is 0, which is the first table).
+        encoding : str, optional
+            Encoding of the HTML content (default is None, which detects it from the page).
 
         Returns
         -------
         Optional[pd.DataFrame]
             DataFrame containing the parsed table data, or None if no table is found or an error occurs.
         """
-        self.url = url
-        html = self.fetch_html()
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            self.html = None
-            tables = soup.find_all("table")
-            if table_index < len(tables):
-                return self.parse_table_data(tables[table_index])
-            print(f"No table found at index {table_index}.")
+        if not html:
+            return None
+        try:
+            tables = pd.read_html(BytesIO(html), flavor="lxml", encoding=encoding)
+        except ValueError as e:
+            logger.warning("Value error in parsing tables: %s", e)
             return None
+        if table_index < len(tables):
+            return tables[table_index]
+        logger.warning("No table found at index %s.", table_index)
         return None
 
-    def parse_table_data(self, table: element.Tag) -> Optional[pd.DataFrame]:
+    def fetch_index_data(self, url, table_index: int = 0, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:  # type: ignore[override]
+        # method implementation
         """
-        Extracts data from a BeautifulSoup table object and converts it into a pandas DataFrame.
+        Parses a table from the fetched HTML content based on the specified index.
 
         Parameters
         ----------
-        table : bs4.element.Tag
-            BeautifulSoup object representing the HTML table to be parsed.
+        table_index : int, optional
+            Index of the table to parse from the HTML (default is 0, which is the first table).
+        columns : List[str], optional
+            Columns to keep from the parsed table (default is None, which keeps all columns).
 
         Returns
         -------
         Optional[pd.DataFrame]
-            DataFrame containing the parsed table data, or None if an error occurs during parsing.
+            DataFrame containing the parsed table data, or None if no table is found or an error occurs.
         """
-        try:
-            headers = [th.text.strip() for th in table.find_all("th")]
-            rows = [
-                [td.text.strip() for td in tr.find_all("td")]
-                for tr in table.find_all("tr")
-            ]
+        html, encoding = self._fetch_bytes(url)
+        data = self._parse(html, table_index, encoding)
+        if data is not None and columns:
+            data = data.loc[:, columns]
+        return data
 
-            # Check if headers or rows are empty
-            if not headers or not any(rows):
-                print("Table headers or rows are empty.")
-                return None
+    @cached(FileCache())
+    def fetch_tickers_data(
+        self, url: str, table_index: int = 0
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetches the name and ticker columns of the shares table, reusing an on-disk
+        copy that is less than a day old.
 
-            return pd.DataFrame(columns=headers, data=rows)
+        The list of shares changes rarely, so repeated runs read it from the cache
+        instead of downloading and parsing the page again.
 
-        except AttributeError as e:
-            print(f"Attribute error during parsing: {e}")
-        except ValueError as e:
-            print(f"Value error in DataFrame creation: {e}")
-        except IndexError as e:
-            print(f"Index error in parsing: {e}")
-        return None
+        Parameters
+        ----------
+        url : str
+            URL of the shares page.
+        table_index : int, optional
+            Index of the table to parse from the HTML (default is 0).
+
+        Returns
+        -------
+        Optional[pd.DataFrame]
+            DataFrame with the "Название" and "Тикер" columns of the shares table,
+            or None if an error occurs.
+        """
+        return self.fetch_index_data(url, table_index, columns=["Название", "Тикер"])
 
-    def validate_data(self, data: pd.DataFrame, tickers_url: str, skip_rows: int = 1, skip_columns: tuple = (1, 2)) -> Optional[pd.DataFrame]:  # type: ignore[override]
+    def validate_data(self, data: pd.DataFrame, tickers: Union[str, pd.DataFrame, None], skip_rows: int = 0, skip_columns: tuple = (1, 2)) -> Optional[pd.DataFrame]:  # type: ignore[override]
         """
         Validates and modifies the given DataFrame by trimming specified rows and columns.
 
@@ -131,8 +184,12 @@ class MMVBDataFetcher(IndexDataFetcher):
         ----------
         data : pd.DataFrame
             DataFrame containing the data to be validated and modified.
+        tickers : str or pd.DataFrame
+            URL of the shares page, or the already fetched shares table, used to map
+            share names to tickers.
         skip_rows : int, optional
-            Number of initial rows to skip (default is 1).
+            Number of initial rows to skip (default is 0; the header row is already
+            consumed by the table parser).
         skip_start_columns : int, optional
             Number of initial columns to skip (default is 1).
         skip_end_columns : int, optional
@@ -141,16 +198,17 @@ class MMVBDataFetcher(IndexDataFetcher):
         Returns
         -------
         Optional[pd.DataFrame]
-            Modified DataFrame after applying the trimming, or None if the input is not a DataFrame or is empty.
+            Modified DataFrame after applying the trimming, or None if the input is not a DataFrame or is empty,
+            or if no index constituent could be matched to a ticker.
         """
         # Check if the data is a DataFrame
         if not isinstance(data, pd.DataFrame):
-            print("Input is not a pandas DataFrame.")
+            logger.warning("Input is not a pandas DataFrame.")
             return None
 
         # Check if the DataFrame is empty
         if data.empty:
-            print("DataFrame is empty.")
+            logger.warning("DataFrame is empty.")
             return None
         validated_data = (
             data.iloc[skip_rows:, skip_columns[0] : -skip_columns[1]]
@@ -158,19 +216,41 @@ class MMVBDataFetcher(IndexDataFetcher):
             else data.iloc[skip_rows:, skip_columns[0] :]
         )
 
-        tickers_data = self.fetch_index_data(tickers_url)
-        validated_data = pd.merge(
-            validated_data,
-            tickers_data[["Название", "Тикер"]],  # type: ignore[index]
-            how="left",
-            on="Название",
+        tickers_data = (
+            self.fetch_tickers_data(tickers) if isinstance(tickers, str) else tickers
         )
-        validated_data = validated_data[["Тикер", "Вес"]]
-        validated_data = validated_data.rename(
-            columns={"Тикер": "ticker", "Вес": "weight"}
-        )
-        validated_data["weight"] = (
-            validated_data["weight"].apply(lambda x: x[:-1]).astype("float")
+        name_tickers = tickers_data[  # type: ignore[index]
+            ["Название", "Тикер"]
+        ].drop_duplicates()
+        # A name mapped to several tickers is ambiguous, so keep its first ticker
+        ambiguous = name_tickers["Название"].duplicated()
+        if ambiguous.any():
+            logger.warning(
+                "Several tickers found for shares, using the first one: %s",
+                ", ".join(name_tickers.loc[ambiguous, "Название"].astype(str).unique()),
+            )
+        name_tickers = name_tickers.loc[~ambiguous]
+        ticker_by_name = dict(zip(name_tickers["Название"], name_tickers["Тикер"]))
+        names = validated_data["Название"]
+        ticker = names.map(ticker_by_name)
+        unmatched = names[ticker.isna()]
+        if not unmatched.empty:
+            logger.warning(
+                "No ticker found for index constituents: %s",
+                ", ".join(unmatched.astype(str)),
+            )
+        validated_data = pd.DataFrame(
+            {
+                "ticker": ticker,
+                "weight": pd.to_numeric(
+                    validated_data["Вес"].str.rstrip("%"), errors="coerce"
+                ),
+            }
         )
+        # Drop index constituents that could not be matched to a ticker
+        validated_data = validated_data.dropna(subset=["ticker"]).reset_index(drop=True)
+        if validated_data.empty:
+            logger.warning("No index constituent could be matched to a ticker.")
+            return None
 
         return validated_data
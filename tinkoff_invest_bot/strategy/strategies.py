@@ -1,10 +1,81 @@
-from math import floor
+import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from tinkoff_invest_bot.api.client_service import ClientService
 from tinkoff_invest_bot.data.fetchers import MMVBDataFetcher
 
+logger = logging.getLogger(__name__)
+
+MAIN_BOARD = "TQBR"
+
+
+def _select_buys(
+    ideal: np.ndarray, rubles: np.ndarray, lot_price: np.ndarray, money: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Selects the positions to top up and the number of lots to buy for each of them.
+
+    Works on plain float64 arrays, without copying or re-aligning the portfolio frame.
+
+    Parameters
+    ----------
+    ideal : np.ndarray
+        Ideal position volume in rubles.
+    rubles : np.ndarray
+        Current position volume in rubles.
+    lot_price : np.ndarray
+        Price of one lot in rubles.
+    money : float
+        Available money in rubles.
+
+    Returns
+    -------
+    tuple
+        The floored rubles to buy for every position, the boolean mask of positions
+        to buy, and the number of lots to buy for the selected positions.
+    """
+    to_buy_rubles = np.floor(ideal - rubles)
+    mask = (to_buy_rubles > 0) & (lot_price <= money) & (to_buy_rubles > lot_price)
+    lots = (to_buy_rubles[mask] // lot_price[mask]).astype(np.int64)
+    return to_buy_rubles, mask, lots
+
+
+def _main_board_listings(shares: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keeps one listing per ticker, preferring the MOEX main board.
+
+    A ticker can be listed on several boards with different FIGIs, lot sizes and
+    prices. The main board listing is kept when there is one, otherwise the first
+    listing returned by the API. The other listings are logged and dropped.
+
+    Parameters
+    ----------
+    shares : pd.DataFrame
+        Shares with 'ticker' and 'class_code' columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        The shares with unique tickers.
+    """
+    # A stable sort moves main board listings first within each ticker
+    shares = shares.sort_values(
+        "class_code", key=lambda codes: codes != MAIN_BOARD, kind="stable"
+    )
+    duplicated = shares["ticker"].duplicated()
+    if duplicated.any():
+        dropped = shares.loc[duplicated]
+        logger.warning(
+            "Ignoring secondary listings of tickers: %s",
+            ", ".join(dropped["ticker"] + " (" + dropped["class_code"] + ")"),
+        )
+    return shares.loc[~duplicated]
+
 
 class MMVBStrategy(MMVBDataFetcher, ClientService):
     """
@@ -25,8 +96,9 @@ class MMVBStrategy(MMVBDataFetcher, ClientService):
         URL to fetch the MMVB index data.
     tickers_url : str
         URL to fetch share tickers information.
-    money : Decimal or None
-        The total money amount in the account's portfolio, fetched using ClientService's get_money method.
+    money : float or None
+        The total money amount in the account's portfolio, fetched lazily by `get_portfolio`
+        using ClientService's get_money method.
 
     Examples
     --------
@@ -38,16 +110,28 @@ class MMVBStrategy(MMVBDataFetcher, ClientService):
         MMVBDataFetcher.__init__(self)
         self.url = "https://smart-lab.ru/q/index_stocks/IMOEX/"
         self.tickers_url = "https://smart-lab.ru/q/shares/"
-        self.money = self.get_money()
+        self.money = None
+        self._mmvb_weights_cache: Optional[Tuple[tuple, pd.DataFrame]] = None
+
+    def close(self) -> None:
+        """
+        Closes the Tinkoff Invest API client and the HTTP session.
+        """
+        ClientService.close(self)
+        MMVBDataFetcher.close(self)
 
     def collect_mmvb_weights(self):
         """
         Collects and validates MMVB index data based on predefined URLs.
 
-        Fetches MMVB index data from the URL specified in the `url` attribute,
-        then validates this data against the tickers URL specified in the
-        `tickers_url` attribute. The method leverages inherited capabilities
-        from MMVBDataFetcher for fetching and validating the data.
+        Concurrently fetches MMVB index data from the URL specified in the `url`
+        attribute and the shares table from the `tickers_url` attribute, then
+        validates the index data against the shares table. The method leverages
+        inherited capabilities from MMVBDataFetcher for fetching and validating
+        the data.
+
+        The index composition changes rarely, so the validated data is memoized
+        for the current UTC day and the pages are only fetched once per day.
 
         Returns
         -------
@@ -60,18 +144,29 @@ class MMVBStrategy(MMVBDataFetcher, ClientService):
         >>> mmvb_data = strategy.collect_mmvb_weights()
         >>> print(mmvb_data)
         """
-        self.data = self.fetch_index_data(self.url)
-        self.data = self.validate_data(self.data, self.tickers_url)
-
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        key = (self.url, self.tickers_url, today)
+        if self._mmvb_weights_cache is not None and self._mmvb_weights_cache[0] == key:
+            self.data = self._mmvb_weights_cache[1].copy()
+            return self.data
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            data_future = executor.submit(self.fetch_index_data, self.url)
+            tickers_future = executor.submit(self.fetch_tickers_data, self.tickers_url)
+            self.data, tickers_data = data_future.result(), tickers_future.result()
+        self.data = self.validate_data(self.data, tickers_data)
+
+        if self.data is not None:
+            self._mmvb_weights_cache = (key, self.data.copy())
         return self.data
 
     def collect_portfolio_information(self):
         """
         Collects comprehensive portfolio information including positions, shares, and their last prices.
 
-        Gathers data on the current positions using `get_positions_info`, retrieves information
-        on shares from `get_shares_info`, and fetches the latest prices for these shares using
-        `get_last_prices_info`. This method integrates functionalities from both inherited classes
+        Gathers data on the current positions using `get_positions_info` in a background thread
+        while retrieving information on shares from `get_shares_info` and the latest prices for
+        these shares using `get_last_prices_info`. This method integrates functionalities from both inherited classes
         to compile a complete view of the portfolio.
 
         Returns
@@ -85,9 +180,12 @@ class MMVBStrategy(MMVBDataFetcher, ClientService):
         >>> positions, shares, prices = strategy.collect_portfolio_information()
         >>> print(positions, shares, prices)
         """
-        self.postions = self.get_positions_info()
-        self.shares = self.get_shares_info()
-        self.prices = self.get_last_prices_info(self.shares["figi"].to_list())
+        # Positions do not depend on shares, so fetch them while shares and prices load
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            positions_future = executor.submit(self.get_positions_info)
+            self.shares = self.get_shares_info()
+            self.prices = self.get_last_prices_info(self.shares["figi"].to_numpy())
+            self.postions = positions_future.result()
 
         return self.postions, self.shares, self.prices
 
@@ -95,9 +193,9 @@ class MMVBStrategy(MMVBDataFetcher, ClientService):
         """
         Aggregates comprehensive market and portfolio information into a single DataFrame.
 
-        Sequentially calls `collect_mmvb_weights` to gather MMVB index data and
-        `collect_portfolio_information` to fetch portfolio positions, shares, and their prices.
-        Merges these datasets on common identifiers ('ticker' and 'figi') to create a unified view
+        Calls `collect_mmvb_weights` to gather MMVB index data in a background thread
+        while `collect_portfolio_information` fetches portfolio positions, shares, and their prices.
+        Combines these datasets on common identifiers ('ticker' and 'figi') to create a unified view
         of the portfolio in relation to MMVB index constituents. Missing balance information
         is filled with zeros.
 
@@ -107,22 +205,40 @@ class MMVBStrategy(MMVBDataFetcher, ClientService):
             A unified DataFrame containing MMVB weights, share information, portfolio positions,
             and the latest share prices.
 
+        Raises
+        ------
+        RuntimeError
+            If the MMVB index weights could not be fetched or matched to tickers.
+
         Examples
         --------
         >>> strategy = MMVBStrategy(token='your_token', account_id='your_account_id')
         >>> combined_info = strategy.collect_information()
         >>> print(combined_info)
         """
-        self.data = self.collect_mmvb_weights()
-        self.positions, self.shares, self.prices = self.collect_portfolio_information()
-
-        # Merge MMVB data with shares, positions, and prices for a comprehensive overview
-        self.data = pd.merge(self.data, self.shares, how="left", on="ticker")
-        self.data = pd.merge(self.data, self.positions, how="left", on="figi")
-        self.data = pd.merge(self.data, self.prices, how="left", on="figi")
-
+        # Scrape the index in the background while the Tinkoff API is queried
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            data_future = executor.submit(self.collect_mmvb_weights)
+            portfolio_information = self.collect_portfolio_information()
+            self.data = data_future.result()
+        if self.data is None:
+            raise RuntimeError("Failed to collect the MMVB index weights.")
+        self.positions, self.shares, self.prices = portfolio_information
+
+        # Look up share details by ticker, then positions and prices by FIGI.
+        # Each lookup key must be unique, as a validate="m:1" merge would require
+        shares_lookup = _main_board_listings(self.shares).set_index("ticker")
+        if not shares_lookup.index.is_unique:
+            raise ValueError("Shares must have one listing per ticker.")
+        for column in ("figi", "lot"):
+            self.data[column] = self.data["ticker"].map(shares_lookup[column])
         # Fill missing balance data with zeros
-        self.data["balance"] = self.data["balance"].fillna(0)
+        self.data["balance"] = (
+            self.data["figi"].map(self.positions.set_index("figi")["balance"]).fillna(0)
+        )
+        self.data["price"] = self.data["figi"].map(
+            self.prices.set_index("figi")["price"]
+        )
         return self.data
 
     def get_portfolio(self):
@@ -148,20 +264,18 @@ class MMVBStrategy(MMVBDataFetcher, ClientService):
         >>> print(portfolio_data)
         """
         self.data = self.collect_information()
-
-        # Calculate lot price and portfolio volume in rubles
-        self.data["lot_price"] = self.data["price"] * self.data["lot"]
-        self.data["portfolio_rubles_volume"] = self.data["price"] * self.data["balance"]
-
-        # Calculate portfolio weight by volume and ideal portfolio distribution
-        self.data["portfolio_weight_volume"] = (
-            self.data["portfolio_rubles_volume"]
-            / (self.data["portfolio_rubles_volume"].sum() + self.money)
-        ) * 100
-        self.data["ideal_portfolio"] = (
-            self.data["weight"]
-            / 100
-            * (self.data["portfolio_rubles_volume"].sum() + self.money)
+        if self.money is None:
+            self.money = self.get_money()
+
+        # Calculate lot price, portfolio volume in rubles, portfolio weight by volume
+        # and ideal portfolio distribution, inserting all columns at once
+        portfolio_rubles_volume = self.data["price"] * self.data["balance"]
+        total = portfolio_rubles_volume.sum() + self.money
+        self.data = self.data.assign(
+            lot_price=self.data["price"] * self.data["lot"],
+            portfolio_rubles_volume=portfolio_rubles_volume,
+            portfolio_weight_volume=portfolio_rubles_volume / total * 100,
+            ideal_portfolio=self.data["weight"] / 100 * total,
         )
 
         return self.data
@@ -187,26 +301,16 @@ class MMVBStrategy(MMVBDataFetcher, ClientService):
         >>> print(shares_to_buy)
         """
         self.portfolio = self.get_portfolio()
-        self.portfolio["to_buy_rubles"] = (
-            self.portfolio["ideal_portfolio"]
-            - self.portfolio["portfolio_rubles_volume"]
-        ).apply(floor)
-        self.portfolio["to_buy"] = (
-            (self.portfolio["to_buy_rubles"] > 0)
-            & (self.portfolio["lot_price"] <= self.money)
-            & (self.portfolio["to_buy_rubles"] > self.portfolio["lot_price"])
+        to_buy_rubles, mask, lots = _select_buys(
+            self.portfolio["ideal_portfolio"].to_numpy(dtype=np.float64),
+            self.portfolio["portfolio_rubles_volume"].to_numpy(dtype=np.float64),
+            self.portfolio["lot_price"].to_numpy(dtype=np.float64),
+            float(self.money),
         )
+        self.portfolio["to_buy_rubles"] = to_buy_rubles
+        self.portfolio["to_buy"] = mask
 
-        self.adjusted_tickers = self.portfolio.loc[
-            self.portfolio["to_buy"] is True
-        ].copy()
-        self.adjusted_tickers["lots_to_buy"] = (
-            self.adjusted_tickers["to_buy_rubles"] // self.adjusted_tickers["lot_price"]
-        ).astype("int")
-        self.adjusted_tickers = (
-            self.adjusted_tickers[["figi", "lots_to_buy"]]
-            .set_index("figi")
-            .to_dict()["lots_to_buy"]
-        )
+        figis = self.portfolio["figi"].to_numpy()[mask]
+        self.adjusted_tickers = dict(zip(figis.tolist(), lots.tolist()))
 
         return self.adjusted_tickers
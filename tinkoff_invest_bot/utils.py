@@ -1,9 +1,6 @@
-from decimal import Decimal
-
-
 def cast_money(v):
     """
-    Converts a money value from the Tinkoff Invest API format to a Decimal.
+    Converts a money value from the Tinkoff Invest API format to a float.
     The Tinkoff Invest API represents money values with separate fields for units and nanos,
     where 'units' is the integer part and 'nanos' is the fractional part in nanoseconds.
 
@@ -14,18 +11,16 @@ def cast_money(v):
 
     Returns
     -------
-    Decimal
-        The combined value of 'units' and 'nano' as a Decimal.
+    float
+        The combined value of 'units' and 'nano' as a float.
 
     Raises
     ------
     ValueError
-        If the input money format is invalid or cannot be converted to Decimal.
+        If the input money format is invalid or cannot be converted to float.
     """
     try:
-        units = Decimal(v.units)
-        nano = Decimal(v.nano)
-    except (TypeError, ValueError) as exc:
+        return v.units + v.nano / 1e9
+    except (AttributeError, TypeError) as exc:
         # Re-raise the exception with a custom message, linking the cause.
         raise ValueError("Invalid money format") from exc
-    return float(units + nano / Decimal(1e9))